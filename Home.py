@@ -1,5 +1,4 @@
 import streamlit as st
-import pandas as pd
 import utils
 
 st.set_page_config(page_title="Dashboard - Monografia AA UFMA", layout="wide")
@@ -7,27 +6,8 @@ st.set_page_config(page_title="Dashboard - Monografia AA UFMA", layout="wide")
 # Configura o tema global (claro/escuro)
 #utils.configurar_tema_global()
 
-# --- Função de Carregamento e Tratamento Inicial ---
-@st.cache_data
-def carregar_dados(uploaded_file):
-    try:
-        # Carrega ignorando as linhas de cabeçalho irrelevantes (padrão do arquivo: 8 linhas)
-        df = pd.read_csv(uploaded_file, skiprows=8)
-        df.columns = df.columns.str.strip()
-        
-        # Tratamento de colunas numéricas para evitar erros de cálculo
-        cols_numericas = [
-            'Total de Vagas Oferecidas', 'Total de Vagas AA Oferecidas',
-            'Vagas totais preenchidas', 'Inscritos totais', 'Inscritos AA'
-        ]
-        for col in cols_numericas:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-        
-        return df
-    except Exception as e:
-        st.error(f"Erro ao processar o arquivo: {e}")
-        return None
+# --- Troca a base se um carregamento em segundo plano terminou ---
+utils.sincronizar_ingestao()
 
 # --- Cabeçalho Institucional ---
 col_logo, col_logo1  = st.columns([6, 6])
@@ -72,32 +52,52 @@ st.markdown("### Fonte de Dados")
 
 arquivo = st.file_uploader("Carregar arquivo CSV (Base de Dados)", type=["csv"])
 
-# --- Processamento ---
+# --- Processamento (em segundo plano) ---
+# O arquivo é lido aqui e processado no pool; a base anterior segue em uso até o novo job terminar.
 if arquivo is not None:
-    df = carregar_dados(arquivo)
-    
-    if df is not None:
-        # --- FILTRAGEM GLOBAL DE ATIVOS ---
-        if 'Situação' in df.columns:
-            df_ativos = df[df['Situação'].astype(str).str.strip().str.upper() == 'ATIVO']
-            
-            # Salva no Session State
-            st.session_state['dados_ppg'] = df_ativos
-            
-            st.success(f" Base de dados carregada com sucesso!")
-            st.info(f"Foram encontrados **{len(df)}** registros totais, dos quais **{len(df_ativos)}** são programas **ATIVOS** que serão utilizados nas análises.")
-            
-        else:
-            st.error("A coluna 'Situação' não foi encontrada no arquivo. Verifique a base de dados.")
+    if st.session_state.get('arquivo_enviado') != arquivo.file_id:
+        st.session_state['arquivo_enviado'] = arquivo.file_id
+        utils.iniciar_ingestao(arquivo.getvalue(), arquivo.name)
 
 # Carregamento automático para demonstração (Opcional - se houver arquivo local)
-elif "dados_ppg" not in st.session_state:
+elif not any(k in st.session_state for k in ("dados_ppg", "job_ingestao", "erro_ingestao", "ingestao_cancelada")):
     try:
         # Tenta carregar arquivo padrão se existir na pasta (facilita para o avaliador)
-        df_padrao = carregar_dados("dados_ufma.csv")
-        if df_padrao is not None and 'Situação' in df_padrao.columns:
-            df_ativos_padrao = df_padrao[df_padrao['Situação'].astype(str).str.strip().str.upper() == 'ATIVO']
-            st.session_state['dados_ppg'] = df_ativos_padrao
-            st.sidebar.info(" Dados padrão carregados automaticamente.")
-    except:
-        st.warning(" Por favor, faça o upload do arquivo CSV para iniciar.")
\ No newline at end of file
+        with open("dados_ufma.csv", "rb") as f:
+            utils.iniciar_ingestao(f.read(), "dados_ufma.csv", padrao=True)
+    except OSError:
+        st.warning(" Por favor, faça o upload do arquivo CSV para iniciar.")
+
+elif "dados_ppg" not in st.session_state and "ingestao_cancelada" in st.session_state:
+    st.warning(" Carregamento cancelado. Por favor, faça o upload do arquivo CSV para iniciar.")
+
+@st.fragment(run_every=1.0)
+def acompanhar_ingestao():
+    job = st.session_state.get('job_ingestao')
+    if job is None:
+        return
+    if job['future'].done():
+        # Reexecuta a página inteira para que sincronizar_ingestao() faça a troca
+        st.rerun()
+
+    progresso = job['progresso']
+    st.progress(progresso['fracao'], text=f"Processando **{job['nome']}**: {progresso['etapa']}...")
+    if 'dados_ppg' in st.session_state:
+        st.caption("As análises continuam usando a base anterior até o término do carregamento.")
+    if st.button("Cancelar carregamento"):
+        utils.cancelar_ingestao()
+        st.rerun()
+
+if 'job_ingestao' in st.session_state:
+    acompanhar_ingestao()
+
+if 'erro_ingestao' in st.session_state:
+    st.error(st.session_state['erro_ingestao'])
+
+resumo = st.session_state.get('resumo_carga')
+if resumo is not None and 'job_ingestao' not in st.session_state:
+    if resumo['padrao']:
+        st.sidebar.info(" Dados padrão carregados automaticamente.")
+    else:
+        st.success(f" Base de dados **{resumo['nome']}** carregada com sucesso!")
+        st.info(f"Foram encontrados **{resumo['qtd_total']}** registros totais, dos quais **{resumo['qtd_ativos']}** são programas **ATIVOS** que serão utilizados nas análises.")
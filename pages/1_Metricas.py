@@ -4,6 +4,9 @@ import utils
 
 st.set_page_config(page_title="Métricas Gerais", layout="wide")
 
+# Troca a base se um carregamento em segundo plano terminou
+utils.sincronizar_ingestao()
+
 #utils.configurar_tema_global()
 
 st.title("Indicadores Gerais de Desempenho")
@@ -4,6 +4,9 @@ import utils
 
 st.set_page_config(page_title="Ações Afirmativas", layout="wide")
 
+# Troca a base se um carregamento em segundo plano terminou
+utils.sincronizar_ingestao()
+
 #utils.configurar_tema_global()
 
 st.title("Indicadores de Ações Afirmativas (Ativos)")
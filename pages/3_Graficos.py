@@ -5,6 +5,9 @@ import utils
 
 st.set_page_config(page_title="Gráficos", layout="wide")
 
+# Troca a base se um carregamento em segundo plano terminou
+utils.sincronizar_ingestao()
+
 # --- RECUPERA CONFIGURAÇÃO DO TEMA ---
 config_visual = utils.configurar_tema_global()
 
@@ -90,11 +93,15 @@ def aplicar_tema(fig):
     return fig
 
 
-# GRÁFICO 1: PIZZA
+# Cada gráfico é calculado só quando sua seção é aberta (ver utils.secao_sob_demanda)
+assinatura = tuple(sel_mod)
 
-st.subheader(" Distribuição dos Programas Ativos por Nível")
 
-if 'Modalidade' in df_filtrado.columns:
+# GRÁFICO 1: PIZZA
+
+def grafico_modalidade():
+    if 'Modalidade' not in df_filtrado.columns:
+        return None
     df_mod = df_filtrado['Modalidade'].value_counts().reset_index()
     df_mod.columns = ['Nível', 'Quantidade']
     
@@ -106,24 +113,27 @@ if 'Modalidade' in df_filtrado.columns:
     fig_mod.update_layout(height=400, font=dict(size=14))
     
     # APLICA TEMA
-    fig_mod = aplicar_tema(fig_mod)
-    
-    st.plotly_chart(fig_mod, use_container_width=True)
-else:
-    st.warning("Dados insuficientes.")
+    return aplicar_tema(fig_mod)
+
+utils.secao_sob_demanda(
+    'graficos_modalidade', " Distribuição dos Programas Ativos por Nível", grafico_modalidade,
+    assinatura, aberta=True
+)
 
 st.markdown("---")
 
 
 # GRÁFICO 2: EVOLUÇÃO LINHA
 
-st.subheader(" Evolução da Implementação por Grupo de Cota")
-col_pre_desc = encontrar_coluna(df_filtrado, ["Se S, quais?", "quais?"]) 
-col_in_desc = encontrar_coluna(df_filtrado, ["quais alterações?"]) 
-col_atende_todas = encontrar_coluna(df_filtrado, ["Atende todas as cotas"])
-col_res_desc = encontrar_coluna(df_filtrado, ["quais atende?"]) 
+def grafico_evolucao_grupos():
+    col_pre_desc = encontrar_coluna(df_filtrado, ["Se S, quais?", "quais?"]) 
+    col_in_desc = encontrar_coluna(df_filtrado, ["quais alterações?"]) 
+    col_atende_todas = encontrar_coluna(df_filtrado, ["Atende todas as cotas"])
+    col_res_desc = encontrar_coluna(df_filtrado, ["quais atende?"]) 
+
+    if not (col_pre_desc and col_in_desc and col_atende_todas):
+        return None
 
-if col_pre_desc and col_in_desc and col_atende_todas:
     grupos_alvo = ['Negros', 'Indígenas', 'PCD', 'Quilombolas', 'Trans']
     contagem = {'Pré-IN': {g: 0 for g in grupos_alvo}, 'Pós-IN': {g: 0 for g in grupos_alvo}, 'Pós-Resolução': {g: 0 for g in grupos_alvo}}
     
@@ -153,95 +163,110 @@ if col_pre_desc and col_in_desc and col_atende_todas:
     fig_evo_line.update_traces(line=dict(width=3), marker=dict(size=10))
     
     # APLICA TEMA
-    fig_evo_line = aplicar_tema(fig_evo_line)
-    
-    st.plotly_chart(fig_evo_line, use_container_width=True)
-else:
-    st.warning("Colunas descritivas não encontradas.")
+    return aplicar_tema(fig_evo_line)
+
+utils.secao_sob_demanda(
+    'graficos_evolucao_grupos', " Evolução da Implementação por Grupo de Cota", grafico_evolucao_grupos,
+    assinatura, aviso="Colunas descritivas não encontradas."
+)
 
 st.markdown("---")
 
 
 # GRÁFICOS 3 e 4
 
-col_g1, col_g2 = st.columns(2)
-
-with col_g1:
-    st.markdown("##### Oferta vs Demanda")
-    if 'Modalidade' in df_filtrado.columns:
-        df_group = df_filtrado.groupby('Modalidade')[['Total de Vagas Oferecidas', 'Inscritos totais']].sum().reset_index()
-        df_melted = df_group.melt(id_vars='Modalidade', value_vars=['Total de Vagas Oferecidas', 'Inscritos totais'], var_name='Métrica', value_name='Quantidade')
-        
-        fig_bar = px.bar(
-            df_melted, x='Modalidade', y='Quantidade', color='Métrica', barmode='group', height=400
-        )
-        # APLICA TEMA
-        fig_bar = aplicar_tema(fig_bar)
-        st.plotly_chart(fig_bar, use_container_width=True)
+def grafico_oferta_demanda():
+    if 'Modalidade' not in df_filtrado.columns:
+        return None
+    df_group = df_filtrado.groupby('Modalidade')[['Total de Vagas Oferecidas', 'Inscritos totais']].sum().reset_index()
+    df_melted = df_group.melt(id_vars='Modalidade', value_vars=['Total de Vagas Oferecidas', 'Inscritos totais'], var_name='Métrica', value_name='Quantidade')
+    
+    fig_bar = px.bar(
+        df_melted, x='Modalidade', y='Quantidade', color='Métrica', barmode='group', height=400
+    )
+    # APLICA TEMA
+    return aplicar_tema(fig_bar)
 
-with col_g2:
-    st.markdown("##### Evolução da Adesão Institucional às Ações Afirmativas")
+def grafico_adesao():
     col_antes = encontrar_coluna(df_filtrado, ["antes da IN"])
     col_in = encontrar_coluna(df_filtrado, ["depois da criação da IN", "após a IN"])
     col_res = encontrar_coluna(df_filtrado, ["depois da criação da Resolução", "após a Resolução"])
     
-    if col_antes and col_in and col_res:
-        s_antes = df_filtrado[col_antes].astype(str).str.strip().str.upper().isin(['S', 'SIM'])
-        s_in = df_filtrado[col_in].astype(str).str.strip().str.upper().isin(['S', 'SIM'])
-        s_res = df_filtrado[col_res].astype(str).str.strip().str.upper().isin(['S', 'SIM'])
-        
-        df_evolucao = pd.DataFrame({
-            'Fase': ['Antes da IN', 'Pós-IN', 'Pós-Resolução'],
-            'Programas com Cotas': [s_antes.sum(), (s_antes|s_in).sum(), (s_antes|s_in|s_res).sum()]
-        })
-        
-        fig_evo_bar = px.bar(
-            df_evolucao, x='Fase', y='Programas com Cotas', text_auto=True, color='Programas com Cotas',
-            color_continuous_scale=px.colors.sequential.Blues, height=400
-        )
-        fig_evo_bar.update_layout(coloraxis_showscale=False, xaxis_title=None, yaxis_title="Nº de Programas (PPGs)")
-        
-        # APLICA TEMA
-        fig_evo_bar = aplicar_tema(fig_evo_bar)
-        st.plotly_chart(fig_evo_bar, use_container_width=True)
+    if not (col_antes and col_in and col_res):
+        return None
+
+    s_antes = df_filtrado[col_antes].astype(str).str.strip().str.upper().isin(['S', 'SIM'])
+    s_in = df_filtrado[col_in].astype(str).str.strip().str.upper().isin(['S', 'SIM'])
+    s_res = df_filtrado[col_res].astype(str).str.strip().str.upper().isin(['S', 'SIM'])
+    
+    df_evolucao = pd.DataFrame({
+        'Fase': ['Antes da IN', 'Pós-IN', 'Pós-Resolução'],
+        'Programas com Cotas': [s_antes.sum(), (s_antes|s_in).sum(), (s_antes|s_in|s_res).sum()]
+    })
+    
+    fig_evo_bar = px.bar(
+        df_evolucao, x='Fase', y='Programas com Cotas', text_auto=True, color='Programas com Cotas',
+        color_continuous_scale=px.colors.sequential.Blues, height=400
+    )
+    fig_evo_bar.update_layout(coloraxis_showscale=False, xaxis_title=None, yaxis_title="Nº de Programas (PPGs)")
+    
+    # APLICA TEMA
+    return aplicar_tema(fig_evo_bar)
+
+col_g1, col_g2 = st.columns(2)
+
+with col_g1:
+    utils.secao_sob_demanda(
+        'graficos_oferta_demanda', "Oferta vs Demanda", grafico_oferta_demanda, assinatura, nivel="markdown"
+    )
+
+with col_g2:
+    utils.secao_sob_demanda(
+        'graficos_adesao', "Evolução da Adesão Institucional às Ações Afirmativas", grafico_adesao,
+        assinatura, nivel="markdown"
+    )
 
 st.markdown("---")
 
 
 # GRÁFICO 5: TAXA DE SUCESSO
 
-st.subheader(" Comparativo de Eficiência: Taxa de Sucesso (Geral vs AA)")
-col_inscritos_aa = 'Inscritos AA'
-if col_inscritos_aa in df_filtrado.columns:
+def grafico_taxa_sucesso():
+    col_inscritos_aa = 'Inscritos AA'
+    if col_inscritos_aa not in df_filtrado.columns:
+        return None
     mask_tem_dados = pd.to_numeric(df_filtrado[col_inscritos_aa], errors='coerce').notna()
     df_comp = df_filtrado[mask_tem_dados].copy()
-    if not df_comp.empty:
-        ins_g = somar_seguro(df_comp, 'Inscritos totais')
-        apr_g = somar_seguro(df_comp, 'Vagas totais preenchidas')
-        taxa_g = (apr_g / ins_g * 100) if ins_g > 0 else 0
-        
-        ins_aa = somar_seguro(df_comp, col_inscritos_aa)
-        col_cota = encontrar_coluna(df_comp, ['preenchidas AA', 'vagas AA preenchidas'])
-        col_ac = encontrar_coluna(df_comp, ['aprovados na AC', 'aprovados AC'])
-        apr_aa_cota = somar_seguro(df_comp, col_cota)
-        apr_aa_ac = somar_seguro(df_comp, col_ac)
-        taxa_aa = ((apr_aa_cota + apr_aa_ac) / ins_aa * 100) if ins_aa > 0 else 0
-        
-        df_chart = pd.DataFrame([
-            {'Categoria': 'Geral', 'Taxa de Sucesso (%)': taxa_g},
-            {'Categoria': 'Candidatos AA', 'Taxa de Sucesso (%)': taxa_aa}
-        ])
-        
-        cores = {'Geral': '#A9A9A9', 'Candidatos AA': '#2E86C1'}
-        fig_comp = px.bar(
-            df_chart, x='Categoria', y='Taxa de Sucesso (%)', color='Categoria', text_auto='.1f',
-            color_discrete_map=cores, height=450
-        )
-        fig_comp.update_layout(yaxis_title="Taxa de Aprovação (%)", xaxis_title=None, showlegend=False)
-        
-        # APLICA TEMA
-        fig_comp = aplicar_tema(fig_comp)
-        
-        st.plotly_chart(fig_comp, use_container_width=True)
-    else:
-        st.warning("Dados insuficientes.")
\ No newline at end of file
+    if df_comp.empty:
+        return None
+
+    ins_g = somar_seguro(df_comp, 'Inscritos totais')
+    apr_g = somar_seguro(df_comp, 'Vagas totais preenchidas')
+    taxa_g = (apr_g / ins_g * 100) if ins_g > 0 else 0
+    
+    ins_aa = somar_seguro(df_comp, col_inscritos_aa)
+    col_cota = encontrar_coluna(df_comp, ['preenchidas AA', 'vagas AA preenchidas'])
+    col_ac = encontrar_coluna(df_comp, ['aprovados na AC', 'aprovados AC'])
+    apr_aa_cota = somar_seguro(df_comp, col_cota)
+    apr_aa_ac = somar_seguro(df_comp, col_ac)
+    taxa_aa = ((apr_aa_cota + apr_aa_ac) / ins_aa * 100) if ins_aa > 0 else 0
+    
+    df_chart = pd.DataFrame([
+        {'Categoria': 'Geral', 'Taxa de Sucesso (%)': taxa_g},
+        {'Categoria': 'Candidatos AA', 'Taxa de Sucesso (%)': taxa_aa}
+    ])
+    
+    cores = {'Geral': '#A9A9A9', 'Candidatos AA': '#2E86C1'}
+    fig_comp = px.bar(
+        df_chart, x='Categoria', y='Taxa de Sucesso (%)', color='Categoria', text_auto='.1f',
+        color_discrete_map=cores, height=450
+    )
+    fig_comp.update_layout(yaxis_title="Taxa de Aprovação (%)", xaxis_title=None, showlegend=False)
+    
+    # APLICA TEMA
+    return aplicar_tema(fig_comp)
+
+utils.secao_sob_demanda(
+    'graficos_taxa_sucesso', " Comparativo de Eficiência: Taxa de Sucesso (Geral vs AA)", grafico_taxa_sucesso,
+    assinatura
+)
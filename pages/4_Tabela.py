@@ -1,8 +1,12 @@
 import streamlit as st
 import pandas as pd
+import utils
 
 st.set_page_config(page_title="Tabela de Dados", layout="wide")
 
+# Troca a base se um carregamento em segundo plano terminou
+utils.sincronizar_ingestao()
+
 st.title(" Base de Dados Completa")
 
 if 'dados_ppg' not in st.session_state:
@@ -0,0 +1,239 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.graph_objects as go
+import plotly.express as px
+import utils
+
+st.set_page_config(page_title="Explorador de Programas", layout="wide")
+
+# Troca a base se um carregamento em segundo plano terminou
+utils.sincronizar_ingestao()
+
+# --- RECUPERA CONFIGURAÇÃO DO TEMA ---
+config_visual = utils.configurar_tema_global()
+
+st.title("Explorador por Programa (Ativos)")
+
+if 'dados_ppg' not in st.session_state:
+    st.error("Por favor, faça o upload do arquivo na página 'Home' primeiro.")
+    st.stop()
+
+df = st.session_state['dados_ppg']
+
+# FILTRAGEM GLOBAL
+if 'Situação' in df.columns:
+    df = df[df['Situação'].astype(str).str.strip().str.upper() == 'ATIVO']
+
+# Acima deste número de pontos os gráficos deixam de enviar todos os programas:
+# a densidade é agregada no servidor e só os destaques (outliers) + uma amostra seguem como pontos.
+LIMITE_PONTOS = 5000
+NUM_BINS = 60
+
+# FILTROS
+with st.sidebar:
+    st.header("Filtros do Explorador")
+    modalidades_alvo = ['Mestrado', 'Doutorado', 'Mestrado/Doutorado', 'Mestrado / Doutorado']
+    opcoes_disponiveis = [m for m in df['Modalidade'].unique() if m in modalidades_alvo] if 'Modalidade' in df.columns else []
+    sel_mod = st.multiselect("Modalidade", opcoes_disponiveis, default=opcoes_disponiveis)
+
+df_filtrado = df.copy()
+if sel_mod: df_filtrado = df_filtrado[df_filtrado['Modalidade'].isin(sel_mod)]
+
+# FUNÇÕES AUXILIARES
+def encontrar_coluna(dataframe, lista_palavras):
+    for col in dataframe.columns:
+        for palavra in lista_palavras:
+            if palavra.lower() in col.lower(): return col
+    return None
+
+def numerico(dataframe, col_name):
+    if col_name and col_name in dataframe.columns:
+        return pd.to_numeric(dataframe[col_name], errors='coerce')
+    return pd.Series(np.nan, index=dataframe.index)
+
+@st.cache_data
+def montar_base_programas(dataframe):
+    """
+    Monta uma linha por programa com as métricas usadas nos gráficos de dispersão.
+    """
+    col_nome = encontrar_coluna(dataframe, ['Programa de Pós'])
+    col_cota = encontrar_coluna(dataframe, ['preenchidas AA', 'vagas AA preenchidas'])
+    col_ac = encontrar_coluna(dataframe, ['aprovados na AC', 'aprovados AC'])
+
+    vagas = numerico(dataframe, 'Total de Vagas Oferecidas')
+    vagas_aa = numerico(dataframe, 'Total de Vagas AA Oferecidas')
+    inscritos = numerico(dataframe, 'Inscritos totais')
+    inscritos_aa = numerico(dataframe, 'Inscritos AA')
+    aprovados_aa = numerico(dataframe, col_cota).fillna(0) + numerico(dataframe, col_ac).fillna(0)
+
+    base = pd.DataFrame({
+        'Programa': dataframe[col_nome].astype(str).str.strip() if col_nome else dataframe.index.astype(str),
+        # Sem Modalidade vira 'N/D' para o programa não sumir no groupby dos gráficos
+        'Modalidade': dataframe['Modalidade'].fillna('N/D').astype(str) if 'Modalidade' in dataframe.columns else 'N/D',
+        'Vagas': vagas,
+        'Inscritos': inscritos,
+        # Divisões por zero viram NaN e o programa sai apenas daquele gráfico
+        'Vagas AA (%)': (vagas_aa / vagas.where(vagas > 0) * 100),
+        'Aprovação AA (%)': (aprovados_aa / inscritos_aa.where(inscritos_aa > 0) * 100),
+        'Candidatos por Vaga': (inscritos / vagas.where(vagas > 0)),
+    })
+    return base.reset_index(drop=True)
+
+def reduzir_pontos(base, col_x, col_y, limite=LIMITE_PONTOS):
+    """
+    Retorna (pontos, densidade). Abaixo do limite todos os programas viram pontos e densidade é None.
+    Acima, a densidade é agregada em uma grade 2D e só metade do limite é usada para os programas mais
+    distantes da mediana (outliers) e a outra metade para uma amostra fixa dos demais.
+    """
+    dados = base.dropna(subset=[col_x, col_y])
+    if len(dados) <= limite:
+        return dados, None
+
+    x = dados[col_x].to_numpy(dtype=float)
+    y = dados[col_y].to_numpy(dtype=float)
+    contagem, bordas_x, bordas_y = np.histogram2d(x, y, bins=NUM_BINS)
+    densidade = {
+        'x': (bordas_x[:-1] + bordas_x[1:]) / 2,
+        'y': (bordas_y[:-1] + bordas_y[1:]) / 2,
+        # histogram2d indexa [x, y]; o Heatmap espera [linha=y, coluna=x]
+        'z': np.where(contagem.T > 0, contagem.T, np.nan),
+    }
+
+    # Distância robusta até a mediana (escala pelo IQR de cada eixo)
+    def escala(v):
+        iqr = np.subtract(*np.percentile(v, [75, 25]))
+        return iqr if iqr > 0 else (np.std(v) or 1.0)
+    distancia = np.hypot((x - np.median(x)) / escala(x), (y - np.median(y)) / escala(y))
+
+    qtd_outliers = limite // 2
+    idx_outliers = np.argpartition(distancia, -qtd_outliers)[-qtd_outliers:]
+    restantes = dados.drop(dados.index[idx_outliers])
+    amostra = restantes.sample(n=min(limite - qtd_outliers, len(restantes)), random_state=0)
+    return pd.concat([dados.iloc[idx_outliers], amostra]), densidade
+
+def grafico_dispersao(base, col_x, col_y, titulo_x, titulo_y):
+    pontos, densidade = reduzir_pontos(base, col_x, col_y)
+    fig = go.Figure()
+
+    if densidade is not None:
+        fig.add_trace(go.Heatmap(
+            x=densidade['x'], y=densidade['y'], z=densidade['z'],
+            colorscale='Greys', showscale=False, opacity=0.6, hoverinfo='skip'
+        ))
+
+    for modalidade, grupo in pontos.groupby('Modalidade', sort=True):
+        fig.add_trace(go.Scattergl(
+            x=grupo[col_x], y=grupo[col_y], mode='markers', name=modalidade,
+            marker=dict(size=9, opacity=0.8, color=cores_modalidade[modalidade]),
+            customdata=np.stack([grupo['Programa'], grupo['Modalidade']], axis=-1),
+            hovertemplate=(
+                "<b>%{customdata[0]}</b><br>Modalidade: %{customdata[1]}<br>"
+                f"{titulo_x}: %{{x:,.1f}}<br>{titulo_y}: %{{y:,.1f}}<extra></extra>"
+            )
+        ))
+
+    fig.update_layout(height=500, xaxis_title=titulo_x, yaxis_title=titulo_y, legend_title_text='Modalidade')
+    nota = None
+    if densidade is not None:
+        nota = f"Mais de {LIMITE_PONTOS:,} programas: o fundo mostra a densidade de todos e os pontos destacam os casos extremos."
+    return aplicar_tema(fig), nota
+
+def grafico_distribuicao(base, coluna, titulo):
+    # Histograma calculado no servidor: o navegador recebe só as barras, não os valores individuais
+    fig = go.Figure()
+    dados = base.dropna(subset=[coluna])
+    if dados.empty:
+        return aplicar_tema(fig)
+    bordas = np.histogram_bin_edges(dados[coluna].to_numpy(dtype=float), bins=min(NUM_BINS, max(len(dados) // 2, 5)))
+    for modalidade, grupo in dados.groupby('Modalidade', sort=True):
+        contagem, _ = np.histogram(grupo[coluna].to_numpy(dtype=float), bins=bordas)
+        fig.add_trace(go.Bar(
+            x=(bordas[:-1] + bordas[1:]) / 2, y=contagem, width=np.diff(bordas), name=modalidade,
+            marker_color=cores_modalidade[modalidade],
+            hovertemplate=f"{titulo}: %{{x:,.1f}}<br>Programas: %{{y}}<extra>{modalidade}</extra>"
+        ))
+    fig.update_layout(barmode='stack', height=400, xaxis_title=titulo, yaxis_title="Nº de Programas", legend_title_text='Modalidade')
+    return aplicar_tema(fig)
+
+# --- FUNÇÃO PARA APLICAR TEMA NOS GRÁFICOS ---
+def aplicar_tema(fig):
+    cor_texto = config_visual['font_color']
+    cor_grade = config_visual['grid_color']
+
+    fig.update_layout(
+        template=config_visual['template'],
+        paper_bgcolor=config_visual['paper_bgcolor'],
+        plot_bgcolor=config_visual['paper_bgcolor'],
+        font=dict(color=cor_texto),
+        title=dict(font=dict(color=cor_texto)),
+        legend=dict(font=dict(color=cor_texto), title=dict(font=dict(color=cor_texto))),
+        xaxis=dict(
+            title_font=dict(color=cor_texto),
+            tickfont=dict(color=cor_texto),
+            gridcolor=cor_grade,
+            zerolinecolor=cor_grade
+        ),
+        yaxis=dict(
+            title_font=dict(color=cor_texto),
+            tickfont=dict(color=cor_texto),
+            gridcolor=cor_grade,
+            zerolinecolor=cor_grade
+        )
+    )
+    return fig
+
+
+base_programas = montar_base_programas(df_filtrado)
+
+if base_programas.empty:
+    st.warning("Dados insuficientes.")
+    st.stop()
+
+# Uma cor fixa por Modalidade, igual em todos os gráficos da página
+cores = px.colors.qualitative.Set2
+cores_modalidade = {
+    modalidade: cores[i % len(cores)] for i, modalidade in enumerate(sorted(base_programas['Modalidade'].unique()))
+}
+
+# Cada gráfico é calculado só quando sua seção é aberta (ver utils.secao_sob_demanda)
+assinatura = tuple(sel_mod)
+
+# GRÁFICO 1: OFERTA vs DEMANDA POR PROGRAMA
+
+utils.secao_sob_demanda(
+    'programas_demanda', " Oferta vs Demanda por Programa",
+    lambda: grafico_dispersao(base_programas, 'Vagas', 'Inscritos', 'Vagas Oferecidas', 'Inscritos Totais'),
+    assinatura, aberta=True
+)
+
+st.markdown("---")
+
+# GRÁFICO 2: RESERVA AA vs APROVAÇÃO AA
+
+utils.secao_sob_demanda(
+    'programas_aa', " Reserva de Vagas AA vs Taxa de Aprovação AA",
+    lambda: grafico_dispersao(base_programas, 'Vagas AA (%)', 'Aprovação AA (%)', 'Vagas AA (% das vagas)', 'Aprovação AA (% dos inscritos AA)'),
+    assinatura
+)
+st.info("ℹ️ Considera apenas programas com vagas ofertadas e Inscritos AA divulgados.")
+
+st.markdown("---")
+
+# GRÁFICOS 3 e 4: DISTRIBUIÇÕES
+
+col_d1, col_d2 = st.columns(2)
+
+with col_d1:
+    utils.secao_sob_demanda(
+        'programas_dist_demanda', "Distribuição de Candidatos por Vaga",
+        lambda: grafico_distribuicao(base_programas, 'Candidatos por Vaga', 'Candidatos por Vaga'),
+        assinatura, nivel="markdown"
+    )
+
+with col_d2:
+    utils.secao_sob_demanda(
+        'programas_dist_aa', "Distribuição da Reserva de Vagas AA",
+        lambda: grafico_distribuicao(base_programas, 'Vagas AA (%)', 'Vagas AA (%)'),
+        assinatura, nivel="markdown"
+    )
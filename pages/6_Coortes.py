@@ -0,0 +1,124 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+import plotly.express as px
+import utils
+
+st.set_page_config(page_title="Análise de Coortes", layout="wide")
+
+# Troca a base se um carregamento em segundo plano terminou
+utils.sincronizar_ingestao()
+
+# --- RECUPERA CONFIGURAÇÃO DO TEMA ---
+config_visual = utils.configurar_tema_global()
+
+st.title("Análise de Coortes (Ativos)")
+
+if 'dados_ppg' not in st.session_state:
+    st.error("Por favor, faça o upload do arquivo na página 'Home' primeiro.")
+    st.stop()
+
+# O índice é montado na Home junto com o carregamento; recalcula só se a sessão não o tiver
+if 'indice_coortes' not in st.session_state:
+    st.session_state['indice_coortes'] = utils.montar_indice_coortes(st.session_state['dados_ppg'])
+
+indice = st.session_state['indice_coortes']
+
+if not indice:
+    st.warning("Nenhuma coluna de ano válida encontrada para montar as coortes.")
+    st.stop()
+
+# FILTROS
+with st.sidebar:
+    st.header("Filtros de Coorte")
+    eixo = st.selectbox("Agrupar programas por", list(indice.keys()))
+    indice_eixo = indice[eixo]
+
+    modalidades_alvo = ['Mestrado', 'Doutorado', 'Mestrado/Doutorado', 'Mestrado / Doutorado']
+    opcoes_disponiveis = [m for m in indice_eixo['modalidades'] if m in modalidades_alvo]
+    sel_mod = st.multiselect("Modalidade", opcoes_disponiveis, default=opcoes_disponiveis)
+
+    ano_min, ano_max = int(indice_eixo['anos'][0]), int(indice_eixo['anos'][-1])
+    if ano_min < ano_max:
+        ano_ini, ano_fim = st.slider("Intervalo de anos", ano_min, ano_max, (ano_min, ano_max))
+    else:
+        ano_ini, ano_fim = ano_min, ano_max
+
+# --- FUNÇÃO PARA APLICAR TEMA NOS GRÁFICOS ---
+def aplicar_tema(fig):
+    cor_texto = config_visual['font_color']
+    cor_grade = config_visual['grid_color']
+
+    fig.update_layout(
+        template=config_visual['template'],
+        paper_bgcolor=config_visual['paper_bgcolor'],
+        plot_bgcolor=config_visual['paper_bgcolor'],
+        font=dict(color=cor_texto),
+        title=dict(font=dict(color=cor_texto)),
+        legend=dict(font=dict(color=cor_texto), title=dict(font=dict(color=cor_texto))),
+        xaxis=dict(
+            title_font=dict(color=cor_texto),
+            tickfont=dict(color=cor_texto),
+            gridcolor=cor_grade,
+            zerolinecolor=cor_grade
+        ),
+        yaxis=dict(
+            title_font=dict(color=cor_texto),
+            tickfont=dict(color=cor_texto),
+            gridcolor=cor_grade,
+            zerolinecolor=cor_grade
+        )
+    )
+    return fig
+
+
+# --- SEÇÃO 1: RESUMO DA COORTE ---
+st.subheader(f"1. Coorte: {eixo} entre {ano_ini} e {ano_fim}")
+
+totais = utils.consultar_coorte(indice_eixo, ano_ini, ano_fim, sel_mod)
+qtd_total = totais['Programas']
+
+def pct(valor):
+    return (valor / qtd_total * 100) if qtd_total > 0 else 0
+
+c1, c2, c3, c4 = st.columns(4)
+c1.metric("Programas na Coorte", qtd_total)
+c2.metric("Com Cotas (Pré-IN)", totais['Pré-IN'], f"{pct(totais['Pré-IN']):.1f}%")
+c3.metric("Com Cotas (Pós-IN)", totais['Pós-IN'], f"{pct(totais['Pós-IN']):.1f}%")
+c4.metric("Com Cotas (Pós-Resolução)", totais['Pós-Resolução'], f"{pct(totais['Pós-Resolução']):.1f}%")
+
+st.markdown("---")
+
+# --- SEÇÃO 2: ADESÃO POR ANO ---
+st.subheader("2. Proporção com Cotas por Ano da Coorte")
+
+# Cada ano é a diferença entre posições vizinhas do acumulado (sem varrer a base)
+anos = indice_eixo['anos']
+mascara = (anos >= ano_ini) & (anos <= ano_fim)
+por_ano = {fase: np.zeros(mascara.sum(), dtype=int) for fase in utils.FASES_COORTE}
+for mod, acumulados in indice_eixo['modalidades'].items():
+    if sel_mod and mod not in sel_mod:
+        continue
+    for fase in utils.FASES_COORTE:
+        por_ano[fase] += np.diff(acumulados[fase])[mascara]
+
+df_ano = pd.DataFrame(por_ano, index=anos[mascara])
+df_ano = df_ano[df_ano['Programas'] > 0]
+
+if not df_ano.empty:
+    df_pct = df_ano[['Pré-IN', 'Pós-IN', 'Pós-Resolução']].div(df_ano['Programas'], axis=0) * 100
+    df_pct.index.name = 'Ano'
+    df_melted = df_pct.reset_index().melt(id_vars='Ano', var_name='Fase', value_name='Programas com Cotas (%)')
+    df_melted['Ano'] = df_melted['Ano'].astype(str)
+
+    fig_coorte = px.bar(
+        df_melted, x='Ano', y='Programas com Cotas (%)', color='Fase', barmode='group', height=450,
+        color_discrete_sequence=px.colors.sequential.Blues[3::2]
+    )
+    fig_coorte.update_layout(xaxis_title=eixo, yaxis_title="Programas com Cotas (%)", yaxis_range=[0, 100])
+
+    # APLICA TEMA
+    fig_coorte = aplicar_tema(fig_coorte)
+    st.plotly_chart(fig_coorte, use_container_width=True)
+else:
+    st.warning("Nenhum programa na coorte selecionada.")
@@ -1,4 +1,10 @@
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import streamlit as st
+import pandas as pd
+import numpy as np
 
 def configurar_tema_global():
     """
@@ -87,4 +93,234 @@ def configurar_tema_global():
         'grid_color': line_color
     }
 
-    return config_graficos
\ No newline at end of file
+    return config_graficos
+
+# --- ÍNDICE DE COORTES ---
+# Eixos de coorte disponíveis (rótulo exibido -> trechos do nome da coluna no CSV)
+EIXOS_COORTE = {
+    'Ano de criação do PPG': ['Ano de criação do PPG'],
+    'Último edital disponível': ['Ultimo Edital Disponivel', 'Último Edital Disponível'],
+    'Ano de início das cotas': ['desde quando tem cota'],
+}
+FASES_COORTE = ['Programas', 'Pré-IN', 'Pós-IN', 'Pós-Resolução']
+
+def _encontrar_coluna(dataframe, lista_palavras):
+    for col in dataframe.columns:
+        for palavra in lista_palavras:
+            if palavra.lower() in col.lower():
+                return col
+    return None
+
+def _marcado_sim(dataframe, col_name):
+    if col_name is None:
+        return pd.Series(False, index=dataframe.index)
+    return dataframe[col_name].astype(str).str.strip().str.upper().isin(['S', 'SIM'])
+
+def montar_indice_coortes(df):
+    """
+    Pré-calcula, para cada eixo de coorte e Modalidade, contagens acumuladas por ano.
+    Qualquer intervalo de anos vira uma diferença entre duas posições dos vetores (ver consultar_coorte).
+    """
+    s_antes = _marcado_sim(df, _encontrar_coluna(df, ["antes da IN"]))
+    s_in = _marcado_sim(df, _encontrar_coluna(df, ["depois da criação da IN", "após a IN"]))
+    s_res = _marcado_sim(df, _encontrar_coluna(df, ["depois da criação da Resolução", "após a Resolução"]))
+    fases = pd.DataFrame({
+        'Programas': True,
+        'Pré-IN': s_antes,
+        'Pós-IN': s_antes | s_in,
+        'Pós-Resolução': s_antes | s_in | s_res,
+    }, index=df.index).astype(int)
+    modalidade = df['Modalidade'].astype(str).str.strip() if 'Modalidade' in df.columns else pd.Series('N/D', index=df.index)
+
+    indice = {}
+    for eixo, palavras in EIXOS_COORTE.items():
+        col = _encontrar_coluna(df, palavras)
+        if col is None:
+            continue
+        anos = pd.to_numeric(df[col], errors='coerce')
+        valido = anos.between(1900, 2100)
+        if not valido.any():
+            continue
+
+        anos = anos[valido].astype(int)
+        grade_anos = np.arange(anos.min(), anos.max() + 1)
+        por_modalidade = {}
+        for mod, grupo in fases[valido].groupby(modalidade[valido]):
+            contagem = grupo.groupby(anos.loc[grupo.index]).sum().reindex(grade_anos, fill_value=0)
+            # Zero à frente: soma de [ini, fim] = acumulado[fim + 1] - acumulado[ini]
+            por_modalidade[mod] = {
+                fase: np.concatenate(([0], contagem[fase].to_numpy().cumsum())) for fase in FASES_COORTE
+            }
+        indice[eixo] = {'anos': grade_anos, 'modalidades': por_modalidade}
+    return indice
+
+def consultar_coorte(indice_eixo, ano_ini, ano_fim, modalidades=None):
+    """
+    Retorna {fase: quantidade} dos programas com ano em [ano_ini, ano_fim] nas modalidades escolhidas.
+    """
+    anos = indice_eixo['anos']
+    ini = np.searchsorted(anos, ano_ini, side='left')
+    fim = np.searchsorted(anos, ano_fim, side='right')
+    totais = {fase: 0 for fase in FASES_COORTE}
+    for mod, acumulados in indice_eixo['modalidades'].items():
+        if modalidades and mod not in modalidades:
+            continue
+        for fase in FASES_COORTE:
+            totais[fase] += int(acumulados[fase][fim] - acumulados[fase][ini])
+    return totais
+
+
+# --- INGESTÃO EM SEGUNDO PLANO ---
+COLUNAS_NUMERICAS = [
+    'Total de Vagas Oferecidas', 'Total de Vagas AA Oferecidas',
+    'Vagas totais preenchidas', 'Inscritos totais', 'Inscritos AA'
+]
+LINHAS_POR_BLOCO = 50_000
+
+class IngestaoCancelada(Exception):
+    pass
+
+@st.cache_resource
+def _pool_ingestao():
+    # Um único pool por processo, compartilhado entre as sessões
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix='ingestao')
+
+def carregar_dados(conteudo, progresso=None, cancelar=None):
+    """
+    Lê o CSV (bytes), trata as colunas numéricas, filtra os programas ATIVOS e monta o índice de coortes.
+    Roda fora da thread do Streamlit: não chama st.*, informa o andamento em `progresso` e lança
+    ValueError com mensagem legível quando o arquivo não é válido.
+    """
+    progresso = progresso if progresso is not None else {}
+    cancelar = cancelar or threading.Event()
+
+    def etapa(fracao, texto):
+        if cancelar.is_set():
+            raise IngestaoCancelada()
+        progresso.update(fracao=fracao, etapa=texto)
+
+    etapa(0.0, "Lendo arquivo")
+    buffer = io.BytesIO(conteudo)
+    blocos = []
+    try:
+        # Carrega ignorando as linhas de cabeçalho irrelevantes (padrão do arquivo: 8 linhas)
+        for bloco in pd.read_csv(buffer, skiprows=8, chunksize=LINHAS_POR_BLOCO):
+            blocos.append(bloco)
+            etapa(0.6 * buffer.tell() / max(len(conteudo), 1), "Lendo arquivo")
+    except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError) as e:
+        raise ValueError(f"O arquivo não pôde ser lido como CSV ({type(e).__name__}): {e}") from e
+    if not blocos:
+        raise ValueError("O arquivo não contém registros após as 8 linhas de cabeçalho.")
+
+    df = pd.concat(blocos, ignore_index=True)
+    df.columns = df.columns.str.strip()
+
+    etapa(0.7, "Convertendo colunas numéricas")
+    for col in COLUNAS_NUMERICAS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+
+    etapa(0.8, "Filtrando programas ativos")
+    if 'Situação' not in df.columns:
+        raise ValueError("A coluna 'Situação' não foi encontrada no arquivo. Verifique a base de dados.")
+    df_ativos = df[df['Situação'].astype(str).str.strip().str.upper() == 'ATIVO']
+
+    etapa(0.9, "Montando índice de coortes")
+    indice = montar_indice_coortes(df_ativos)
+
+    etapa(1.0, "Concluído")
+    return {'dados_ppg': df_ativos, 'indice_coortes': indice, 'qtd_total': len(df)}
+
+def iniciar_ingestao(conteudo, nome, padrao=False):
+    """
+    Envia o arquivo ao pool e guarda o job na sessão. Um job anterior ainda em andamento é cancelado.
+    """
+    cancelar_ingestao()
+    progresso = {'fracao': 0.0, 'etapa': "Na fila"}
+    cancelar = threading.Event()
+    st.session_state['job_ingestao'] = {
+        'future': _pool_ingestao().submit(carregar_dados, conteudo, progresso, cancelar),
+        'progresso': progresso,
+        'cancelar': cancelar,
+        'nome': nome,
+        'padrao': padrao,
+    }
+    st.session_state.pop('erro_ingestao', None)
+    st.session_state.pop('ingestao_cancelada', None)
+
+def cancelar_ingestao():
+    job = st.session_state.pop('job_ingestao', None)
+    if job is not None:
+        job['cancelar'].set()
+        job['future'].cancel()
+        # Impede que a Home reinicie sozinha o carregamento da base padrão
+        st.session_state['ingestao_cancelada'] = True
+
+def sincronizar_ingestao():
+    """
+    Chamada no início de cada página: se o job terminou, troca a base da sessão de uma vez.
+    Enquanto isso, as páginas continuam usando a base anterior.
+    """
+    job = st.session_state.get('job_ingestao')
+    if job is None or not job['future'].done():
+        return
+    del st.session_state['job_ingestao']
+
+    try:
+        resultado = job['future'].result()
+    except IngestaoCancelada:
+        return
+    except Exception as e:
+        st.session_state['erro_ingestao'] = f"Erro ao processar '{job['nome']}': {e}"
+        return
+
+    st.session_state.update({
+        # Versão da base: invalida os gráficos guardados por secao_sob_demanda
+        'versao_dados': st.session_state.get('versao_dados', 0) + 1,
+        'dados_ppg': resultado['dados_ppg'],
+        'indice_coortes': resultado['indice_coortes'],
+        'resumo_carga': {
+            'nome': job['nome'],
+            'padrao': job['padrao'],
+            'qtd_total': resultado['qtd_total'],
+            'qtd_ativos': len(resultado['dados_ppg']),
+        },
+    })
+
+
+# --- SEÇÕES DE GRÁFICO SOB DEMANDA ---
+def secao_sob_demanda(chave, titulo, construir, assinatura=(), aberta=False, aviso="Dados insuficientes.", nivel="subheader"):
+    """
+    Exibe o título da seção e só chama `construir()` (que retorna uma figura Plotly, uma tupla
+    (figura, nota) ou None) quando a seção é aberta. A figura fica guardada na sessão enquanto `assinatura` (filtros, tema) e a base não mudarem,
+    então reabrir a seção ou trocar de página não refaz o cálculo nem o envio de seções fechadas.
+    """
+    if nivel == "subheader":
+        st.subheader(titulo)
+    else:
+        st.markdown(f"##### {titulo}")
+
+    # Estado aberto/fechado fora da chave do widget, que o Streamlit descarta ao trocar de página
+    chave_aberta = f"secao_aberta_{chave}"
+    if chave_aberta not in st.session_state:
+        st.session_state[chave_aberta] = aberta
+    st.session_state[chave_aberta] = st.toggle(
+        "Exibir gráfico", value=st.session_state[chave_aberta], key=f"secao_{chave}"
+    )
+    if not st.session_state[chave_aberta]:
+        st.caption("Seção recolhida: ative para calcular e exibir o gráfico.")
+        return
+
+    cache = st.session_state.setdefault('cache_secoes', {})
+    assinatura = (tuple(assinatura), st.session_state.get('tema_escuro'), st.session_state.get('versao_dados'))
+    if chave not in cache or cache[chave][0] != assinatura:
+        cache[chave] = (assinatura, construir())
+
+    resultado = cache[chave][1]
+    fig, nota = resultado if isinstance(resultado, tuple) else (resultado, None)
+    if nota:
+        st.caption(nota)
+    if fig is None:
+        st.warning(aviso)
+    else:
+        st.plotly_chart(fig, use_container_width=True)